@@ -1,68 +1,46 @@
+from startup_profile import PROFILE
+PROFILE.start()
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import calendar
 from datetime import datetime
 
+from dashboard_constants import (
+    COMPARISON_DIMENSIONS,
+    DASHBOARD_CSS,
+    DATA_PATH,
+    EXCEL_MAX_ROWS,
+    EXCLUDED_MARKETS,
+    EXPORT_FORMATS,
+    INTERVENTION_COSTS,
+    KPI_DELTA_FORMATS,
+    MONTH_ORDER,
+    PAGE_CONFIG,
+    PERIOD_TYPES,
+)
+from dashboard_export import available_export_formats, export_bytes
+from dashboard_periods import (
+    compare_periods,
+    default_comparison_periods,
+    period_is_complete,
+    period_sums,
+)
+
 ##commit
 
-st.set_page_config(
-    page_title="Medication Adherence Dashboard",
-    page_icon="💊",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+st.set_page_config(**PAGE_CONFIG)
 
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #1E3A8A;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        font-size: 1.8rem;
-        font-weight: 600;
-        color: #2563EB;
-        margin-top: 1rem;
-    }
-    .metric-card {
-        background-color: #F3F4F6;
-        border-radius: 0.5rem;
-        padding: 1rem;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.12), 0 1px 2px rgba(0,0,0,0.24);
-    }
-    .metric-value {
-        font-size: 2rem;
-        font-weight: 700;
-        color: #1E3A8A;
-    }
-    .metric-label {
-        font-size: 1rem;
-        color: #4B5563;
-    }
-    .highlight {
-        background-color: #DBEAFE;
-        padding: 0.25rem 0.5rem;
-        border-radius: 0.25rem;
-        font-weight: 600;
-    }
-    .stProgress > div > div > div > div {
-        background-color: #3B82F6;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(DASHBOARD_CSS, unsafe_allow_html=True)
+PROFILE.mark("imports")
 
 @st.cache_data
 def load_data():
+    import numpy as np
+
     try:
-        # Replace with your actual file path
-        df = pd.read_csv('./QS_Q1_Outcomes_3_10_25.csv')
+        # Replace with your actual file path in dashboard_constants.py
+        df = pd.read_csv(DATA_PATH)
         
         # Convert Last Activity Date to datetime and handle errors
         df["Last Activity Date"] = pd.to_datetime(df["Last Activity Date"], errors='coerce')
@@ -84,8 +62,7 @@ def load_data():
             df["Week"] = df["Last Activity Date"].dt.week
             
         # Filter out specific markets
-        excluded_markets = ['Chicago', 'LasVegas', 'NewHampshire', 'NewJersey', 'NrthIndiana']
-        df = df[~df['MarketCode'].isin(excluded_markets)]
+        df = df[~df['MarketCode'].isin(EXCLUDED_MARKETS)]
         
         # Check for and create success metrics if they don't exist
         if "Intervention Successful" not in df.columns:
@@ -103,24 +80,11 @@ def load_data():
         if "Intervention Cost" not in df.columns:
             # Create placeholder cost metrics
             # In a real scenario, this would be based on your intervention types
-            intervention_costs = {
-                "Phone outreach": 25,
-                "Mail reminder": 10,
-                "Pharmacy coordination": 40,
-                "Provider outreach": 50,
-                "Benefits review": 35,
-                "Educational materials": 15,
-                "Medication therapy management": 75,
-                "Transportation assistance": 100,
-                "Financial assistance": 150,
-                "Simplified regimen": 30,
-                "No intervention": 0
-            }
             
             # Use a default cost if the Quality Specialist Intervention column doesn't exist
             if "Quality Specialist Intervention" in df.columns:
                 df["Intervention Cost"] = df["Quality Specialist Intervention"].map(
-                    lambda x: intervention_costs.get(x, 30) if pd.notna(x) else 30
+                    lambda x: INTERVENTION_COSTS.get(x, 30) if pd.notna(x) else 30
                 )
             else:
                 df["Intervention Cost"] = 30
@@ -135,20 +99,70 @@ def load_data():
         st.error(f"Error loading data: {str(e)}")
         return pd.DataFrame()
 
+@st.cache_data
+def get_filter_mask(_df, start_date, end_date, market, med_type, payer):
+    # _df is the cached frame from load_data, so it is left out of the cache key
+    mask = ((_df["Last Activity Date"].dt.date >= start_date) &
+            (_df["Last Activity Date"].dt.date <= end_date))
+    if market != "All":
+        mask &= _df["MarketCode"] == market
+    if med_type != "All":
+        mask &= _df["MedAdherenceMeasureCode"] == med_type
+    if payer != "All":
+        mask &= _df["PayerCode"] == payer
+    return mask.to_numpy()
+
+@st.cache_data
+def get_period_labels(_df, freq):
+    return sorted(_df["Last Activity Date"].dt.to_period(freq).astype(str).unique().tolist())
+
+@st.cache_data
+def get_period_aggregates(_df, freq, market, med_type, payer):
+    min_date = _df["Last Activity Date"].min().date()
+    max_date = _df["Last Activity Date"].max().date()
+    return period_sums(_df[get_filter_mask(_df, min_date, max_date, market, med_type, payer)], freq)
+
+def render_metric_delta(comparison_totals, kpi, period_a):
+    if comparison_totals is None:
+        return
+    delta = comparison_totals[("Delta", kpi)].iloc[0]
+    direction = "delta-up" if delta > 0 else "delta-down" if delta < 0 else ""
+    st.markdown(
+        f"<div class='metric-delta {direction}'>{KPI_DELTA_FORMATS[kpi].format(delta)} vs {period_a}</div>",
+        unsafe_allow_html=True
+    )
+
+def render_download(frame, file_stem, export_format, mask=None, label="Download data"):
+    extension, mime = EXPORT_FORMATS[export_format]
+    row_count = len(frame) if mask is None else int(mask.sum())
+    too_large = export_format == "Excel" and row_count > EXCEL_MAX_ROWS
+    st.download_button(
+        label,
+        # Deferred so the export is only built when the button is clicked
+        data=lambda: export_bytes(frame, export_format, mask),
+        file_name=f"{file_stem}.{extension}",
+        mime=mime,
+        key=f"download_{file_stem}",
+        on_click="ignore",
+        disabled=too_large,
+        help=f"Excel export is limited to {EXCEL_MAX_ROWS:,} rows; use CSV or Parquet instead." if too_large else None
+    )
+
 # Load the data
 df = load_data()
+PROFILE.mark("data_loaded")
 
 if df.empty:
     st.error("No data available. Please check your data file and try again.")
     st.stop()
 
-# Define month order for sorting
-month_order = ["January", "February", "March", "April", "May", "June",
-            "July", "August", "September", "October", "November", "December"]
-
 # Sidebar filters
 st.sidebar.markdown("## Dashboard Filters")
 
+# Period comparison replaces the date range with two selected periods
+compare_mode = st.sidebar.checkbox("Compare Periods")
+period_a = period_b = None
+
 # Date range filter
 min_date = df["Last Activity Date"].min().date()
 max_date = df["Last Activity Date"].max().date()
@@ -156,43 +170,71 @@ date_range = st.sidebar.date_input(
     "Date Range",
     [min_date, max_date],
     min_value=min_date,
-    max_value=max_date
+    max_value=max_date,
+    disabled=compare_mode
 )
 
 # Convert to datetime for filtering
 if len(date_range) == 2:
     start_date, end_date = date_range
-    filtered_df = df[(df["Last Activity Date"].dt.date >= start_date) & 
-                    (df["Last Activity Date"].dt.date <= end_date)]
 else:
-    filtered_df = df
     start_date = min_date
     end_date = max_date
 
+if compare_mode:
+    period_type = st.sidebar.selectbox("Period Type", list(PERIOD_TYPES))
+    period_freq = PERIOD_TYPES[period_type]
+    periods = get_period_labels(df, period_freq)
+
+    last_activity = df["Last Activity Date"].max()
+    default_a, default_b = default_comparison_periods(periods, period_freq, last_activity)
+    period_a = st.sidebar.selectbox("Period A", periods, index=default_a)
+    period_b = st.sidebar.selectbox("Period B", periods, index=default_b)
+    if not period_is_complete(period_b, period_freq, last_activity):
+        st.sidebar.caption(
+            f"Period B is only partly covered: data ends {last_activity.strftime('%B %d, %Y')}."
+        )
+
+    # Charts and exports show Period B
+    start_date = pd.Period(period_b, freq=period_freq).start_time.date()
+    end_date = pd.Period(period_b, freq=period_freq).end_time.date()
+
 # Market filter
 markets = ["All"] + sorted(df["MarketCode"].unique().tolist())
 selected_market = st.sidebar.selectbox("Market", markets)
-if selected_market != "All":
-    filtered_df = filtered_df[filtered_df["MarketCode"] == selected_market]
 
 # Medication Type filter
+selected_med_type = "All"
 if "MedAdherenceMeasureCode" in df.columns:
     med_types = ["All"] + df["MedAdherenceMeasureCode"].unique().tolist()
     selected_med_type = st.sidebar.selectbox("Medication Type", med_types)
-    if selected_med_type != "All":
-        filtered_df = filtered_df[filtered_df["MedAdherenceMeasureCode"] == selected_med_type]
 
 # Payer filter
+selected_payer = "All"
 if "PayerCode" in df.columns:
     payers = ["All"] + df["PayerCode"].unique().tolist()
     selected_payer = st.sidebar.selectbox("Payer", payers)
-    if selected_payer != "All":
-        filtered_df = filtered_df[filtered_df["PayerCode"] == selected_payer]
+
+filter_mask = get_filter_mask(df, start_date, end_date, selected_market, selected_med_type, selected_payer)
+filtered_df = df[filter_mask]
+
+comparison_totals = None
+if compare_mode:
+    period_aggregates = get_period_aggregates(df, period_freq, selected_market, selected_med_type, selected_payer)
+    comparison_totals = compare_periods(period_aggregates["Total"], period_a, period_b)
+
+# Export
+st.sidebar.markdown("## Export")
+export_format = st.sidebar.selectbox("Export Format", available_export_formats())
+with st.sidebar:
+    render_download(df, "filtered_gaps", export_format, mask=filter_mask, label="Download filtered gaps")
 
 # Main dashboard
 st.markdown("<div class='main-header'>Medication Adherence Program Dashboard</div>", unsafe_allow_html=True)
 st.markdown(f"**Reporting Period:** {start_date.strftime('%B %d, %Y')} to {end_date.strftime('%B %d, %Y')}",
            unsafe_allow_html=True)
+if compare_mode:
+    st.markdown(f"**Comparing:** {period_b} against {period_a}", unsafe_allow_html=True)
 
 # Metrics row
 metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
@@ -203,6 +245,7 @@ with metric_col1:
     st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
     st.markdown(f"<div class='metric-value'>{total_gaps:,}</div>", unsafe_allow_html=True)
     st.markdown("<div class='metric-label'>Total Adherence Gaps</div>", unsafe_allow_html=True)
+    render_metric_delta(comparison_totals, "Total Adherence Gaps", period_a)
     st.markdown("</div>", unsafe_allow_html=True)
 
 # Metric 2: Gap closure rate
@@ -212,6 +255,7 @@ with metric_col2:
     st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
     st.markdown(f"<div class='metric-value'>{gap_closure_rate:.1%}</div>", unsafe_allow_html=True)
     st.markdown("<div class='metric-label'>Gap Closure Rate</div>", unsafe_allow_html=True)
+    render_metric_delta(comparison_totals, "Gap Closure Rate", period_a)
     st.markdown("</div>", unsafe_allow_html=True)
 
 # Metric 3: Worked vs. Not Worked
@@ -220,6 +264,7 @@ with metric_col3:
     st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
     st.markdown(f"<div class='metric-value'>{worked_pct:.1%}</div>", unsafe_allow_html=True)
     st.markdown("<div class='metric-label'>Gaps Worked</div>", unsafe_allow_html=True)
+    render_metric_delta(comparison_totals, "Gaps Worked", period_a)
     st.markdown("</div>", unsafe_allow_html=True)
 
 # Metric 4: ROI
@@ -230,10 +275,60 @@ with metric_col4:
     st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
     st.markdown(f"<div class='metric-value'>{roi:.1f}x</div>", unsafe_allow_html=True)
     st.markdown("<div class='metric-label'>Program ROI</div>", unsafe_allow_html=True)
+    render_metric_delta(comparison_totals, "Program ROI", period_a)
     st.markdown("</div>", unsafe_allow_html=True)
+PROFILE.mark("first_render")
+
+# Plotly is imported after the header metrics so they render before it loads
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 
 st.markdown("---")
 
+# Period-over-period comparison by market, payer and intervention
+if compare_mode:
+    st.markdown("<div class='sub-header'>Period-over-Period Comparison</div>", unsafe_allow_html=True)
+    comparison_kpi = st.selectbox("Comparison KPI", list(KPI_DELTA_FORMATS))
+    comparison_cols = st.columns(len(COMPARISON_DIMENSIONS))
+
+    for comparison_col, (column, label) in zip(comparison_cols, COMPARISON_DIMENSIONS.items()):
+        with comparison_col:
+            try:
+                if column in period_aggregates:
+                    comparison = compare_periods(period_aggregates[column], period_a, period_b)
+                    chart_data = comparison.xs(comparison_kpi, axis=1, level=1).reset_index()
+                    chart_data.columns = [label, "Period A", "Period B", "Change"]
+                    chart_data = chart_data.sort_values("Change", ascending=False)
+
+                    tick_format = ".0%" if "%" in KPI_DELTA_FORMATS[comparison_kpi] else None
+                    fig = px.bar(
+                        chart_data,
+                        x=label,
+                        y="Change",
+                        color="Change",
+                        color_continuous_scale="RdBu",
+                        color_continuous_midpoint=0,
+                        hover_data=["Period A", "Period B"],
+                        labels={"Period A": period_a, "Period B": period_b},
+                        title=f"{comparison_kpi} Change by {label}"
+                    )
+                    fig.update_layout(
+                        height=350,
+                        yaxis=dict(tickformat=tick_format)
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    period_names = {"Period A": f"Period A ({period_a})", "Period B": f"Period B ({period_b})", "Delta": "Change"}
+                    comparison.columns = [f"{kpi} - {period_names[side]}" for side, kpi in comparison.columns]
+                    render_download(comparison.reset_index(), f"{label.lower().replace(' ', '_')}_comparison", export_format)
+                else:
+                    st.info(f"{label} comparison not available: Missing '{column}' column.")
+            except Exception as e:
+                st.error(f"Error generating {label.lower()} comparison chart: {str(e)}")
+
+    st.markdown("---")
+
 # Row 1: Performance & Intervention Effectiveness
 st.markdown("<div class='sub-header'>Performance & Intervention Effectiveness</div>", unsafe_allow_html=True)
 row1_col1, row1_col2 = st.columns(2)
@@ -245,7 +340,7 @@ with row1_col1:
         ).reset_index()
         monthly_data.columns = ["Month", "Success Rate"]
         
-        monthly_data["Month_num"] = monthly_data["Month"].apply(lambda x: month_order.index(x) if x in month_order else 0)
+        monthly_data["Month_num"] = monthly_data["Month"].apply(lambda x: MONTH_ORDER.index(x) if x in MONTH_ORDER else 0)
         monthly_data = monthly_data.sort_values("Month_num")
         
         fig = px.line(
@@ -263,6 +358,7 @@ with row1_col1:
             hovermode="x unified"
         )
         st.plotly_chart(fig, use_container_width=True)
+        render_download(monthly_data.drop(columns="Month_num"), "monthly_closure_rate", export_format)
     except Exception as e:
         st.error(f"Error generating monthly performance chart: {str(e)}")
         st.info("Please check that your data contains the necessary columns.")
@@ -298,6 +394,7 @@ with row1_col2:
                 yaxis=dict(autorange="reversed")
             )
             st.plotly_chart(fig, use_container_width=True)
+            render_download(intervention_success, "intervention_effectiveness", export_format)
         else:
             st.info("Intervention effectiveness chart not available: Missing 'Quality Specialist Intervention' column.")
     except Exception as e:
@@ -326,6 +423,7 @@ with row2_col1:
         )
         fig.update_layout(height=350)
         st.plotly_chart(fig, use_container_width=True)
+        render_download(gap_status_counts, "gap_status", export_format)
     except Exception as e:
         st.error(f"Error generating gap status chart: {str(e)}")
 
@@ -358,6 +456,7 @@ with row2_col2:
             yaxis_title="Days to Resolution"
         )
         st.plotly_chart(fig, use_container_width=True)
+        render_download(resolution_time, "resolution_time_by_market", export_format)
     except Exception as e:
         st.error(f"Error generating resolution time chart: {str(e)}")
 
@@ -385,6 +484,7 @@ with row3_col1:
                 yaxis=dict(autorange="reversed")
             )
             st.plotly_chart(fig, use_container_width=True)
+            render_download(barriers, "top_barriers", export_format)
         else:
             st.info("Barriers chart not available: Missing 'Barrier Identified' column.")
     except Exception as e:
@@ -408,6 +508,7 @@ with row3_col2:
         )
         fig.update_layout(height=350)
         st.plotly_chart(fig, use_container_width=True)
+        render_download(geo_issues, "geographic_distribution", export_format)
     except Exception as e:
         st.error(f"Error generating geographic distribution chart: {str(e)}")
 
@@ -448,6 +549,7 @@ with row4_col1:
                 height=350
             )
             st.plotly_chart(fig, use_container_width=True)
+            render_download(pd.DataFrame({"Stage": stages, "Count": values}), "escalation_funnel", export_format)
         else:
             st.info("Escalation funnel not available: Missing escalation columns.")
     except Exception as e:
@@ -484,6 +586,7 @@ with row4_col2:
                 )
             )
             st.plotly_chart(fig, use_container_width=True)
+            render_download(med_analysis, "medication_analysis", export_format)
         else:
             st.info("Medication analysis not available: Missing medication columns.")
     except Exception as e:
@@ -525,6 +628,7 @@ with row5_col1:
                 yaxis=dict(tickformat=".0%")
             )
             st.plotly_chart(fig, use_container_width=True)
+            render_download(top_providers, "provider_analysis", export_format)
         else:
             st.info("Provider analysis not available: Missing 'Provider' column.")
     except Exception as e:
@@ -591,6 +695,7 @@ with row5_col2:
                 )
             )
             st.plotly_chart(fig, use_container_width=True)
+            render_download(payer_data, "payer_analysis", export_format)
         else:
             st.info("Payer analysis not available: Missing 'PayerCode' column.")
     except Exception as e:
@@ -615,7 +720,7 @@ with row6_col1:
         monthly_roi["ROI"] = monthly_roi[0].apply(lambda x: x["ROI"])
         monthly_roi = monthly_roi.drop(0, axis=1)
         
-        monthly_roi["Month_num"] = monthly_roi["Month Name"].apply(lambda x: month_order.index(x) if x in month_order else 0)
+        monthly_roi["Month_num"] = monthly_roi["Month Name"].apply(lambda x: MONTH_ORDER.index(x) if x in MONTH_ORDER else 0)
         monthly_roi = monthly_roi.sort_values("Month_num")
         
         fig = make_subplots(specs=[[{"secondary_y": True}]])
@@ -669,6 +774,7 @@ with row6_col1:
         fig.update_yaxes(title_text="Return on Investment", tickformat=".1f", secondary_y=True)
         
         st.plotly_chart(fig, use_container_width=True)
+        render_download(monthly_roi.drop(columns="Month_num"), "monthly_financial_impact", export_format)
     except Exception as e:
         st.error(f"Error generating monthly financial impact chart: {str(e)}")
 
@@ -707,8 +813,10 @@ with row6_col2:
                 yaxis=dict(autorange="reversed")
             )
             st.plotly_chart(fig, use_container_width=True)
+            render_download(barrier_roi, "barrier_roi", export_format)
         else:
             st.info("Barrier ROI analysis not available: Missing 'Barrier Identified' column.")
     except Exception as e:
         st.error(f"Error generating barrier ROI chart: {str(e)}")
 
+PROFILE.finish()
\ No newline at end of file
@@ -0,0 +1,124 @@
+# Constants for the adherence dashboard. Streamlit re-executes the page script
+# on every interaction, but this module is imported once per process.
+
+PAGE_CONFIG = dict(
+    page_title="Medication Adherence Dashboard",
+    page_icon="💊",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+DASHBOARD_CSS = """
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        font-weight: 700;
+        color: #1E3A8A;
+        text-align: center;
+        margin-bottom: 1rem;
+    }
+    .sub-header {
+        font-size: 1.8rem;
+        font-weight: 600;
+        color: #2563EB;
+        margin-top: 1rem;
+    }
+    .metric-card {
+        background-color: #F3F4F6;
+        border-radius: 0.5rem;
+        padding: 1rem;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.12), 0 1px 2px rgba(0,0,0,0.24);
+    }
+    .metric-value {
+        font-size: 2rem;
+        font-weight: 700;
+        color: #1E3A8A;
+    }
+    .metric-label {
+        font-size: 1rem;
+        color: #4B5563;
+    }
+    .highlight {
+        background-color: #DBEAFE;
+        padding: 0.25rem 0.5rem;
+        border-radius: 0.25rem;
+        font-weight: 600;
+    }
+    .metric-delta {
+        font-size: 0.9rem;
+        font-weight: 600;
+        color: #4B5563;
+    }
+    .delta-up {
+        color: #15803D;
+    }
+    .delta-down {
+        color: #B91C1C;
+    }
+    .stProgress > div > div > div > div {
+        background-color: #3B82F6;
+    }
+</style>
+"""
+
+DATA_PATH = './QS_Q1_Outcomes_3_10_25.csv'
+
+# Markets excluded from the dashboard
+EXCLUDED_MARKETS = ['Chicago', 'LasVegas', 'NewHampshire', 'NewJersey', 'NrthIndiana']
+
+# Placeholder cost per intervention type, used when the data has no cost column
+INTERVENTION_COSTS = {
+    "Phone outreach": 25,
+    "Mail reminder": 10,
+    "Pharmacy coordination": 40,
+    "Provider outreach": 50,
+    "Benefits review": 35,
+    "Educational materials": 15,
+    "Medication therapy management": 75,
+    "Transportation assistance": 100,
+    "Financial assistance": 150,
+    "Simplified regimen": 30,
+    "No intervention": 0
+}
+
+# Month order for sorting
+MONTH_ORDER = ["January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December"]
+
+# Period types for comparison mode, as pandas period frequencies
+PERIOD_TYPES = {"Month": "M", "Quarter": "Q"}
+
+# Dimensions broken out in comparison mode, by column name
+COMPARISON_DIMENSIONS = {
+    "MarketCode": "Market",
+    "PayerCode": "Payer",
+    "Quality Specialist Intervention": "Intervention Type",
+}
+
+# Header KPIs and how their period-over-period deltas are formatted
+KPI_DELTA_FORMATS = {
+    "Total Adherence Gaps": "{:+,.0f}",
+    "Gap Closure Rate": "{:+.1%}",
+    "Gaps Worked": "{:+.1%}",
+    "Program ROI": "{:+.1f}x",
+}
+
+# Export settings
+EXPORT_CHUNK_ROWS = 50_000
+EXCEL_MAX_ROWS = 100_000
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+# Cold-start budgets in seconds, checked by `python startup_profile.py --check` and
+# tests/test_cold_start.py. Set to about 2x the times measured on the test fixture
+# (first render ~0.9s, full render ~2.0s); re-measure when the dashboard changes.
+COLD_START_BUDGET_SECONDS = 2.0
+FULL_RENDER_BUDGET_SECONDS = 4.0
+
+# Chart-only modules that must not be imported before the header metrics render.
+# Streamlit already imports plotly.graph_objects for its chart theme, so only
+# plotly.express is actually deferred.
+DEFERRED_IMPORTS = ("plotly.express",)
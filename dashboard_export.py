@@ -0,0 +1,97 @@
+# Chunked file exports for the adherence dashboard. Kept free of Streamlit calls
+# so the page script and tests can share it.
+import importlib.util
+import io
+
+import pandas as pd
+
+from dashboard_constants import EXPORT_CHUNK_ROWS
+
+
+def available_export_formats():
+    formats = ["CSV"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        formats.append("Parquet")
+    if importlib.util.find_spec("openpyxl") is not None:
+        formats.append("Excel")
+    return formats
+
+
+def iter_frame_chunks(frame, mask=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    # Slice the source frame chunk by chunk so the filtered rows are never copied in full
+    for start in range(0, len(frame), chunk_rows):
+        chunk = frame.iloc[start:start + chunk_rows]
+        if mask is not None:
+            chunk = chunk[mask[start:start + chunk_rows]]
+        yield chunk
+
+
+class _ChunkSink:
+    # Minimal writable file for pyarrow that hands back bytes as they are written
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def stream_export(frame, export_format, mask=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    if export_format == "CSV":
+        yield frame.head(0).to_csv(index=False).encode("utf-8")
+        for chunk in iter_frame_chunks(frame, mask, chunk_rows):
+            yield chunk.to_csv(index=False, header=False).encode("utf-8")
+    elif export_format == "Parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Infer the schema from the whole frame, since any one chunk may hold only nulls
+        schema = pa.Schema.from_pandas(frame, preserve_index=False)
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+        for chunk in iter_frame_chunks(frame, mask, chunk_rows):
+            if chunk.empty:
+                continue
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+    elif export_format == "Excel":
+        # openpyxl builds the workbook in memory, so Excel is limited to small exports
+        output = io.BytesIO()
+        with pd.ExcelWriter(output, engine="openpyxl") as writer:
+            frame.head(0).to_excel(writer, index=False)
+            row = 1
+            for chunk in iter_frame_chunks(frame, mask, chunk_rows):
+                chunk.to_excel(writer, index=False, header=False, startrow=row)
+                row += len(chunk)
+        yield output.getvalue()
+    else:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+
+def export_bytes(frame, export_format, mask=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    # Streamlit reads the download into a single bytes object and keeps it in its
+    # in-memory media storage, so only the encoding is chunked, not the download.
+    # Each chunk is written into one buffer and released before the next is encoded.
+    output = io.BytesIO()
+    for data in stream_export(frame, export_format, mask, chunk_rows):
+        output.write(data)
+    return output.getvalue()
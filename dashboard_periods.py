@@ -0,0 +1,63 @@
+# Period-over-period comparison for the adherence dashboard. Kept free of
+# Streamlit calls so the page script can cache it and tests can import it.
+import pandas as pd
+
+from dashboard_constants import COMPARISON_DIMENSIONS
+
+MEASURES = ["Gaps", "Worked", "Closed", "Savings", "Costs"]
+
+
+def period_sums(frame, freq):
+    # Additive sums per period, so any two periods can be compared without rescanning the rows
+    worked = frame["Gap Status"] == "Gap Worked"
+    sums = pd.DataFrame({
+        "Period": frame["Last Activity Date"].dt.to_period(freq).astype(str),
+        "Gaps": 1,
+        "Worked": worked,
+        "Closed": worked & frame["Intervention Successful"],
+        "Savings": frame["Estimated Savings"],
+        "Costs": frame["Intervention Cost"],
+    })
+    aggregates = {"Total": sums.assign(Scope="All").groupby(["Period", "Scope"])[MEASURES].sum()}
+    for column in COMPARISON_DIMENSIONS:
+        if column in frame.columns:
+            aggregates[column] = sums.assign(**{column: frame[column]}).groupby(["Period", column])[MEASURES].sum()
+    return aggregates
+
+
+def compute_kpis(sums):
+    # Same definitions as the header metrics
+    kpis = pd.DataFrame(index=sums.index)
+    kpis["Total Adherence Gaps"] = sums["Gaps"]
+    kpis["Gap Closure Rate"] = (sums["Closed"] / sums["Worked"]).where(sums["Worked"] > 0, 0.0)
+    kpis["Gaps Worked"] = (sums["Worked"] / sums["Gaps"]).where(sums["Gaps"] > 0, 0.0)
+    kpis["Program ROI"] = ((sums["Savings"] - sums["Costs"]) / sums["Costs"]).where(sums["Costs"] > 0, 0.0)
+    return kpis
+
+
+def compare_periods(sums, period_a, period_b):
+    groups = sums.index.get_level_values(1).unique()
+
+    def period_kpis(period):
+        if period in sums.index.get_level_values("Period"):
+            period_sums = sums.xs(period, level="Period")
+        else:
+            period_sums = sums.iloc[0:0].droplevel("Period")
+        return compute_kpis(period_sums.reindex(groups, fill_value=0))
+
+    kpis_a = period_kpis(period_a)
+    kpis_b = period_kpis(period_b)
+    return pd.concat({"Period A": kpis_a, "Period B": kpis_b, "Delta": kpis_b - kpis_a}, axis=1)
+
+
+def period_is_complete(period, freq, last_activity):
+    # Dates are parsed to midnight, so compare calendar days rather than timestamps
+    return pd.Period(period, freq=freq).end_time.date() <= last_activity.date()
+
+
+def default_comparison_periods(periods, freq, last_activity):
+    # Default to the last two periods the data fully covers, so the headline
+    # delta does not compare a partial period against a full one
+    complete_periods = [p for p in periods if period_is_complete(p, freq, last_activity)]
+    index_b = periods.index(complete_periods[-1]) if len(complete_periods) >= 2 else len(periods) - 1
+    return max(index_b - 1, 0), index_b
@@ -0,0 +1,154 @@
+"""Cold-start profiling for the adherence dashboard.
+
+The dashboard marks points in its first completed script run on ``PROFILE``.
+Running this module starts a fresh interpreter, executes the dashboard once and
+reports the import and first-render times:
+
+    python startup_profile.py            # print the report
+    python startup_profile.py --check    # exit 1 if over budget
+
+--check fails when first render exceeds COLD_START_BUDGET_SECONDS, full render
+exceeds FULL_RENDER_BUDGET_SECONDS, or a DEFERRED_IMPORTS package is loaded
+before the first render. The budgets can be overridden with the
+DASHBOARD_COLD_START_BUDGET and DASHBOARD_FULL_RENDER_BUDGET environment
+variables. Run it from the directory that holds the data file, or pass --cwd.
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "adherence_dashboard.py")
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.start_time = None
+        self.marks = {}
+        self.modules = {}
+        self.finished = False
+
+    def start(self):
+        # Restart on every script run until one completes, so a run that stopped
+        # early does not leave a stale start time for later sessions
+        if not self.finished:
+            self.start_time = time.perf_counter()
+            self.marks = {}
+            self.modules = {}
+
+    def mark(self, name):
+        if not self.finished and self.start_time is not None:
+            self.marks[name] = time.perf_counter() - self.start_time
+            self.modules[name] = set(sys.modules)
+
+    def finish(self):
+        if not self.finished and self.start_time is not None:
+            self.mark("full_render")
+            self.finished = True
+            # Logged at WARNING so it shows under Streamlit's default log level
+            logger.warning("Dashboard cold start: %s", self.format_report())
+
+    def report(self):
+        return dict(self.marks)
+
+    def modules_at(self, name):
+        """Modules that were imported when ``name`` was marked."""
+        return sorted(self.modules.get(name, ()))
+
+    def format_report(self):
+        return ", ".join(f"{name}={seconds:.3f}s" for name, seconds in self.marks.items())
+
+
+PROFILE = StartupProfiler()
+
+
+_CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_import = time.perf_counter() - start
+at = AppTest.from_file(sys.argv[1], default_timeout=float(sys.argv[2])).run()
+import startup_profile
+from dashboard_constants import DEFERRED_IMPORTS
+report = {"streamlit_import": streamlit_import}
+report.update(startup_profile.PROFILE.report())
+report["errors"] = [str(e.value) for e in at.exception] + [str(e.value) for e in at.error]
+loaded = startup_profile.PROFILE.modules_at("first_render")
+report["early_imports"] = [name for name in DEFERRED_IMPORTS if name in loaded]
+print(json.dumps(report))
+"""
+
+
+def measure_cold_start(dashboard_path=DASHBOARD_PATH, timeout=120, cwd=None):
+    """Run the dashboard once in a fresh interpreter and return its profile.
+
+    ``cwd`` is the directory the dashboard runs in, which must hold its data file.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [os.path.dirname(dashboard_path), env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD_SCRIPT, dashboard_path, str(timeout)],
+        capture_output=True, text=True, env=env, timeout=timeout, cwd=cwd
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Dashboard cold start failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def budget_failures(report, cold_start_budget, full_render_budget):
+    """Return a message for each budget the profile ``report`` exceeds."""
+    failures = []
+    if report["errors"]:
+        failures.append("Dashboard rendered with errors: " + "; ".join(report["errors"]))
+    # Streamlit itself is already imported by a running server, so it is reported
+    # separately and the budgets cover the page script only
+    for mark, budget in (("first_render", cold_start_budget), ("full_render", full_render_budget)):
+        seconds = report.get(mark)
+        if seconds is None:
+            failures.append(f"Dashboard stopped before {mark}.")
+        elif seconds > budget:
+            failures.append(f"Cold start regressed: {mark} took {seconds:.3f}s, budget is {budget:.3f}s")
+    if report["early_imports"]:
+        failures.append("Imported before first render: " + ", ".join(report["early_imports"]))
+    return failures
+
+
+def main(argv=None):
+    from dashboard_constants import COLD_START_BUDGET_SECONDS, FULL_RENDER_BUDGET_SECONDS
+
+    parser = argparse.ArgumentParser(description="Measure dashboard cold-start time.")
+    parser.add_argument("--check", action="store_true",
+                        help="exit with status 1 if the dashboard is over budget")
+    parser.add_argument("--budget", type=float,
+                        default=float(os.environ.get("DASHBOARD_COLD_START_BUDGET", COLD_START_BUDGET_SECONDS)),
+                        help="first-render budget in seconds")
+    parser.add_argument("--full-render-budget", type=float,
+                        default=float(os.environ.get("DASHBOARD_FULL_RENDER_BUDGET", FULL_RENDER_BUDGET_SECONDS)),
+                        help="full-render budget in seconds")
+    parser.add_argument("--cwd", help="directory to run the dashboard in (default: current directory)")
+    args = parser.parse_args(argv)
+
+    report = measure_cold_start(cwd=args.cwd)
+    for name, seconds in report.items():
+        if name not in ("errors", "early_imports"):
+            print(f"{name:>20}: {seconds:.3f}s")
+    print(f"{'first render budget':>20}: {args.budget:.3f}s")
+    print(f"{'full render budget':>20}: {args.full_render_budget:.3f}s")
+
+    failures = budget_failures(report, args.budget, args.full_render_budget)
+    for failure in failures:
+        print(failure)
+    if failures and (args.check or report["errors"]):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("plotly")
+
+from dashboard_constants import COLD_START_BUDGET_SECONDS, DATA_PATH, FULL_RENDER_BUDGET_SECONDS
+from startup_profile import budget_failures, measure_cold_start
+
+
+def write_fixture_data(directory, rows=5000):
+    dates = pd.date_range("2025-01-01", "2025-06-30", periods=rows)
+    data = pd.DataFrame({
+        "Last Activity Date": dates.strftime("%Y-%m-%d"),
+        "MarketCode": [["Ohio", "Texas", "Florida"][i % 3] for i in range(rows)],
+        "Gap Status": [["Gap Worked", "Gap Not Worked"][i % 2] for i in range(rows)],
+        "MedAdherenceMeasureCode": [["MAC", "MAD", "MAH"][i % 3] for i in range(rows)],
+        "PayerCode": [["P1", "P2"][i % 2] for i in range(rows)],
+        "Quality Specialist Intervention": [["Phone outreach", "Mail reminder"][i % 2] for i in range(rows)],
+        "Barrier Identified": [["Cost", "Side effects", "Forgetfulness"][i % 3] for i in range(rows)],
+        "Escalation": [["Yes", "No"][i % 2] for i in range(rows)],
+        "Escalation Outcome": [["Resolved", "Pending"][i % 2] for i in range(rows)],
+        "NDCDesc": [["DrugA", "DrugB"][i % 2] for i in range(rows)],
+        "Provider": [f"Provider {i % 20}" for i in range(rows)],
+    })
+    data.to_csv(os.path.join(directory, DATA_PATH), index=False)
+
+
+def test_cold_start_within_budget(tmp_path):
+    write_fixture_data(tmp_path)
+
+    report = measure_cold_start(cwd=tmp_path)
+
+    failures = budget_failures(
+        report,
+        float(os.environ.get("DASHBOARD_COLD_START_BUDGET", COLD_START_BUDGET_SECONDS)),
+        float(os.environ.get("DASHBOARD_FULL_RENDER_BUDGET", FULL_RENDER_BUDGET_SECONDS)),
+    )
+    assert failures == []
@@ -0,0 +1,69 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard_export import export_bytes
+
+CHUNK_ROWS = 10
+
+READERS = {
+    "CSV": pd.read_csv,
+    "Parquet": pd.read_parquet,
+    "Excel": pd.read_excel,
+}
+REQUIRED_MODULES = {"CSV": None, "Parquet": "pyarrow", "Excel": "openpyxl"}
+
+
+def make_gaps(rows=30):
+    # Text columns are object dtype, as pandas < 3 loads them from CSV
+    return pd.DataFrame({
+        "MarketCode": pd.Series([["Ohio", "Texas", "Florida"][i % 3] for i in range(rows)], dtype=object),
+        "Time to Resolution": list(range(rows)),
+        # All null in the first chunk, text afterwards
+        "Barrier Identified": pd.Series([None] * CHUNK_ROWS + ["Cost"] * (rows - CHUNK_ROWS), dtype=object),
+    })
+
+
+def round_trip(frame, export_format, mask):
+    module = REQUIRED_MODULES[export_format]
+    if module is not None:
+        pytest.importorskip(module)
+    data = export_bytes(frame, export_format, mask, chunk_rows=CHUNK_ROWS)
+    return READERS[export_format](io.BytesIO(data))
+
+
+@pytest.mark.parametrize("export_format", list(READERS))
+def test_mask_that_empties_first_chunk(export_format):
+    frame = make_gaps()
+    mask = np.arange(len(frame)) >= CHUNK_ROWS + 5
+
+    exported = round_trip(frame, export_format, mask)
+
+    assert len(exported) == mask.sum()
+    assert list(exported.columns) == list(frame.columns)
+    assert exported["Time to Resolution"].tolist() == frame.loc[mask, "Time to Resolution"].tolist()
+
+
+@pytest.mark.parametrize("export_format", list(READERS))
+def test_column_null_in_one_chunk(export_format):
+    frame = make_gaps()
+
+    exported = round_trip(frame, export_format, None)
+
+    assert len(exported) == len(frame)
+    assert list(exported.columns) == list(frame.columns)
+    assert exported["Barrier Identified"].isna().sum() == CHUNK_ROWS
+    assert (exported["Barrier Identified"].dropna() == "Cost").all()
+
+
+@pytest.mark.parametrize("export_format", list(READERS))
+def test_empty_mask(export_format):
+    frame = make_gaps()
+    mask = np.zeros(len(frame), dtype=bool)
+
+    exported = round_trip(frame, export_format, mask)
+
+    assert len(exported) == 0
+    assert list(exported.columns) == list(frame.columns)
@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from dashboard_periods import compare_periods, default_comparison_periods, period_sums
+
+
+def make_gaps():
+    return pd.DataFrame({
+        "Last Activity Date": pd.to_datetime([
+            "2025-01-05", "2025-01-20", "2025-02-03", "2025-02-10", "2025-02-25",
+        ]),
+        "MarketCode": ["Ohio", "Texas", "Ohio", "Ohio", "Florida"],
+        "Gap Status": ["Gap Worked", "Gap Not Worked", "Gap Worked", "Gap Worked", "Gap Not Worked"],
+        "Intervention Successful": [True, False, True, False, False],
+        "Estimated Savings": [3000, 0, 2000, 0, 0],
+        "Intervention Cost": [25, 10, 25, 50, 10],
+    })
+
+
+def test_delta_is_period_b_minus_period_a():
+    aggregates = period_sums(make_gaps(), "M")
+
+    totals = compare_periods(aggregates["Total"], "2025-01", "2025-02")
+
+    assert totals.loc["All", ("Period A", "Total Adherence Gaps")] == 2
+    assert totals.loc["All", ("Period B", "Total Adherence Gaps")] == 3
+    assert totals.loc["All", ("Period B", "Gap Closure Rate")] == pytest.approx(0.5)
+    assert totals.loc["All", ("Period B", "Program ROI")] == pytest.approx((2000 - 85) / 85)
+    pd.testing.assert_frame_equal(totals["Delta"], totals["Period B"] - totals["Period A"])
+
+
+def test_groups_missing_from_a_period_compare_against_zero():
+    aggregates = period_sums(make_gaps(), "M")
+
+    markets = compare_periods(aggregates["MarketCode"], "2025-01", "2025-02")
+
+    assert set(markets.index) == {"Ohio", "Texas", "Florida"}
+    assert markets.loc["Florida", ("Period A", "Total Adherence Gaps")] == 0
+    assert markets.loc["Florida", ("Delta", "Total Adherence Gaps")] == 1
+    assert markets.loc["Texas", ("Period B", "Gap Closure Rate")] == 0
+
+
+def test_period_missing_from_data_gives_zeros():
+    aggregates = period_sums(make_gaps(), "M")
+
+    totals = compare_periods(aggregates["Total"], "2024-12", "2025-01")
+
+    assert (totals["Period A"] == 0).all(axis=None)
+    pd.testing.assert_frame_equal(totals["Delta"], totals["Period B"])
+
+
+def test_default_uses_last_two_periods_when_data_ends_on_period_end():
+    periods = ["2025-04", "2025-05", "2025-06"]
+
+    defaults = default_comparison_periods(periods, "M", pd.Timestamp("2025-06-30"))
+
+    assert defaults == (1, 2)
+
+
+def test_default_skips_partial_last_period():
+    periods = ["2025-04", "2025-05", "2025-06"]
+
+    defaults = default_comparison_periods(periods, "M", pd.Timestamp("2025-06-29"))
+
+    assert defaults == (0, 1)
+
+
+def test_default_falls_back_to_last_two_periods_when_few_are_complete():
+    periods = ["2025Q1", "2025Q2"]
+
+    defaults = default_comparison_periods(periods, "Q", pd.Timestamp("2025-06-29"))
+
+    assert defaults == (0, 1)